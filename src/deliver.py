@@ -3,85 +3,164 @@ from __future__ import annotations
 import csv
 import json
 import logging
+import operator
+import os
+import shutil
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 from typing import Any
 
-logger = logging.getLogger(__name__)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
 
+logger = logging.getLogger(__name__)
 
-def _project_root() -> Path:
-    return Path(__file__).resolve().parents[1]
 
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_CHANNEL_ORDER = ("paid_social", "search", "email", "organic", "direct", "unknown")
+_BASE_FIELDS = (
+    "week_start",
+    "revenue",
+    "orders",
+    "aov",
+    "returning_revenue_share",
+    "revenue_wow",
+    "orders_wow",
+    "aov_wow",
+    "returning_share_wow",
+    "spend",
+    "ctr",
+    "cvr",
+    "cpc",
+    "cac_proxy",
+    "spend_wow",
+    "ctr_wow",
+    "cvr_wow",
+    "cac_proxy_wow",
+    "mer",
+    "mer_wow",
+    "anomaly_count",
+    "anomaly_rules",
+)
+_CHANNEL_KEYS = tuple(
+    (channel, f"revenue_{channel}", f"spend_{channel}", f"roas_{channel}") for channel in _CHANNEL_ORDER
+)
+_CHANNEL_FIELDS = tuple(key for _, *keys in _CHANNEL_KEYS for key in keys)
+_WEEKLY_FIELDNAMES: tuple[str, ...] = _BASE_FIELDS + _CHANNEL_FIELDS
+_LARGE_PAYLOAD_BYTES = 1 << 20
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _has_weekly_metrics(metrics: dict[str, Any]) -> bool:
+    return bool(metrics.get("sales_weekly") or metrics.get("marketing_weekly") or metrics.get("efficiency_weekly"))
+
+
+def _weekly_metrics_rows(metrics: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    if not _has_weekly_metrics(metrics):
+        return
 
-def _weekly_metrics_rows(metrics: dict[str, Any]) -> list[dict[str, Any]]:
     sales = {row["week_start"]: row for row in metrics.get("sales_weekly", [])}
     marketing = {row["week_start"]: row for row in metrics.get("marketing_weekly", [])}
     efficiency = {row["week_start"]: row for row in metrics.get("efficiency_weekly", [])}
 
-    anomalies_by_week: dict[str, list[str]] = {}
+    anomalies_by_week: defaultdict[str, list[str]] = defaultdict(list)
     for item in metrics.get("anomalies", []):
-        week = str(item.get("week_start"))
-        anomalies_by_week.setdefault(week, []).append(str(item.get("rule_id", "unknown")))
+        anomalies_by_week[str(item.get("week_start"))].append(str(item.get("rule_id", "unknown")))
 
     weeks = sorted(set(sales) | set(marketing) | set(efficiency))
-    rows: list[dict[str, Any]] = []
-    channel_order = ["paid_social", "search", "email", "organic", "direct", "unknown"]
 
     for week in weeks:
         s = sales.get(week, {})
         m = marketing.get(week, {})
         e = efficiency.get(week, {})
+        s_wow = s.get("wow") or {}
+        m_wow = m.get("wow") or {}
+        e_wow = e.get("wow") or {}
+        week_anomalies = anomalies_by_week.get(week, [])
         row: dict[str, Any] = {
             "week_start": week,
             "revenue": s.get("revenue"),
             "orders": s.get("orders"),
             "aov": s.get("aov"),
             "returning_revenue_share": s.get("returning_revenue_share"),
-            "revenue_wow": (s.get("wow") or {}).get("revenue"),
-            "orders_wow": (s.get("wow") or {}).get("orders"),
-            "aov_wow": (s.get("wow") or {}).get("aov"),
-            "returning_share_wow": (s.get("wow") or {}).get("returning_revenue_share"),
+            "revenue_wow": s_wow.get("revenue"),
+            "orders_wow": s_wow.get("orders"),
+            "aov_wow": s_wow.get("aov"),
+            "returning_share_wow": s_wow.get("returning_revenue_share"),
             "spend": m.get("spend"),
             "ctr": m.get("ctr"),
             "cvr": m.get("cvr"),
             "cpc": m.get("cpc"),
             "cac_proxy": m.get("cac_proxy"),
-            "spend_wow": (m.get("wow") or {}).get("spend"),
-            "ctr_wow": (m.get("wow") or {}).get("ctr"),
-            "cvr_wow": (m.get("wow") or {}).get("cvr"),
-            "cac_proxy_wow": (m.get("wow") or {}).get("cac_proxy"),
+            "spend_wow": m_wow.get("spend"),
+            "ctr_wow": m_wow.get("ctr"),
+            "cvr_wow": m_wow.get("cvr"),
+            "cac_proxy_wow": m_wow.get("cac_proxy"),
             "mer": e.get("mer"),
-            "mer_wow": (e.get("wow") or {}).get("mer"),
-            "anomaly_count": len(anomalies_by_week.get(week, [])),
-            "anomaly_rules": ";".join(anomalies_by_week.get(week, [])),
+            "mer_wow": e_wow.get("mer"),
+            "anomaly_count": len(week_anomalies),
+            "anomaly_rules": ";".join(week_anomalies),
         }
 
         revenue_by_channel = s.get("revenue_by_channel") or {}
         spend_by_channel = m.get("spend_by_channel") or {}
         roas_by_channel = e.get("roas_by_channel") or {}
-        for channel in channel_order:
-            row[f"revenue_{channel}"] = revenue_by_channel.get(channel)
-            row[f"spend_{channel}"] = spend_by_channel.get(channel)
-            row[f"roas_{channel}"] = roas_by_channel.get(channel)
-        rows.append(row)
-    return rows
+        for channel, revenue_key, spend_key, roas_key in _CHANNEL_KEYS:
+            row[revenue_key] = revenue_by_channel.get(channel)
+            row[spend_key] = spend_by_channel.get(channel)
+            row[roas_key] = roas_by_channel.get(channel)
+        yield row
 
 
-def _write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
-    if not rows:
-        path.write_text("", encoding="utf-8")
+def _metrics_json_bytes(metrics: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(metrics, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_metrics_json(path: Path, metrics: dict[str, Any]) -> None:
+    """Write the metrics payload; large payloads use a raw fd and a single data sync."""
+    payload = _metrics_json_bytes(metrics)
+    if len(payload) <= _LARGE_PAYLOAD_BYTES:
+        path.write_bytes(payload)
         return
-    fieldnames = list(rows[0].keys())
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+        _fdatasync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_csv(path: Path, fieldnames: tuple[str, ...], rows: Iterator[dict[str, Any]]) -> Path:
+    """Stream rows to path in fieldnames order, always emitting the header."""
+    get_fields = operator.itemgetter(*fieldnames)
     with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+        writer = csv.writer(handle)
+        writer.writerow(fieldnames)
+        writer.writerows(map(get_fields, rows))
+    return path
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Point target at source's content, hardlinking when the filesystem allows it."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
 
 
 def write_reports(report_md: str, metrics: dict[str, Any], run_date: date) -> dict[str, str]:
     """Write the markdown and metrics artifacts to reports/."""
-    reports_dir = _project_root() / "reports"
+    reports_dir = _PROJECT_ROOT / "reports"
     reports_dir.mkdir(parents=True, exist_ok=True)
 
     date_str = run_date.isoformat()
@@ -91,18 +170,32 @@ def write_reports(report_md: str, metrics: dict[str, Any], run_date: date) -> di
     weekly_csv = reports_dir / f"weekly_report_{date_str}.csv"
     latest_csv = reports_dir / "latest.csv"
 
-    weekly_md.write_text(report_md.strip() + "\n", encoding="utf-8")
-    latest_md.write_text(report_md.strip() + "\n", encoding="utf-8")
-    metrics_json.write_text(json.dumps(metrics, indent=2, ensure_ascii=False), encoding="utf-8")
-    rows = _weekly_metrics_rows(metrics)
-    _write_csv(weekly_csv, rows)
-    _write_csv(latest_csv, rows)
-
-    logger.info("Wrote report artifacts to %s", reports_dir)
-    return {
+    md_payload = (report_md.strip() + "\n").encode("utf-8")
+    saved = {
         "weekly_report": str(weekly_md),
         "latest_report": str(latest_md),
         "metrics_json": str(metrics_json),
-        "weekly_csv": str(weekly_csv),
-        "latest_csv": str(latest_csv),
     }
+
+    # The three artifacts are independent; overlap their writes and link latest.* once each source lands.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        md_future = executor.submit(weekly_md.write_bytes, md_payload)
+        json_future = executor.submit(_write_metrics_json, metrics_json, metrics)
+        csv_future = None
+        if _has_weekly_metrics(metrics):
+            csv_future = executor.submit(_write_csv, weekly_csv, _WEEKLY_FIELDNAMES, _weekly_metrics_rows(metrics))
+
+        md_future.result()
+        _link_or_copy(weekly_md, latest_md)
+        if csv_future is not None:
+            _link_or_copy(csv_future.result(), latest_csv)
+            saved["weekly_csv"] = str(weekly_csv)
+            saved["latest_csv"] = str(latest_csv)
+        else:
+            # Drop the previous run's link so latest.csv never describes a different week than latest.md.
+            latest_csv.unlink(missing_ok=True)
+            logger.debug("No weekly metrics; skipping %s and removed %s", weekly_csv.name, latest_csv.name)
+        json_future.result()
+
+    logger.info("Wrote report artifacts to %s", reports_dir)
+    return saved
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import io
 import logging
 import os
 from pathlib import Path
@@ -21,15 +20,14 @@ EXPECTED_ADS_COLUMNS = [
 ]
 
 
-def _project_root() -> Path:
-    return Path(__file__).resolve().parents[1]
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 
 def _resolve_path(path: str) -> Path:
     candidate = Path(path)
     if candidate.is_absolute():
         return candidate
-    return _project_root() / candidate
+    return _PROJECT_ROOT / candidate
 
 
 def load_orders_csv(path: str) -> pd.DataFrame:
@@ -48,9 +46,10 @@ def load_ads_data(ads_url_env: str = "ADS_CSV_URL", fallback_path: str = "data/a
     if ads_url:
         logger.info("Attempting to fetch ads CSV from %s env var", ads_url_env)
         try:
-            response = requests.get(ads_url, timeout=20)
-            response.raise_for_status()
-            df = pd.read_csv(io.StringIO(response.text))
+            with requests.get(ads_url, timeout=20, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                df = pd.read_csv(response.raw)
             logger.info("Loaded ads CSV from URL (%s rows)", len(df))
             return df
         except Exception as exc:  # noqa: BLE001 - fallback behavior is intentional
@@ -3,10 +3,17 @@ from __future__ import annotations
 import json
 import logging
 import os
+from collections import Counter
+from functools import lru_cache
 from typing import Any
 
 from openai import OpenAI
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 GROQ_BASE_URL = "https://api.groq.com/openai/v1"
@@ -14,23 +21,27 @@ GROQ_MODEL = "openai/gpt-oss-120b"
 MAX_WEEK_HISTORY_FOR_LLM = 3
 MAX_ANOMALIES_FOR_LLM = 12
 
+_CURRENCY_FORMAT = "${:,.2f}".format
+_PCT_FORMAT = "{:.1%}".format
+_RATIO_FORMAT = "{:.2f}x".format
+
+
+@lru_cache(maxsize=4)
+def _client(base_url: str, api_key: str) -> OpenAI:
+    """Reuse one SDK client (and its connection pool) per endpoint/key."""
+    return OpenAI(base_url=base_url, api_key=api_key)
+
 
 def _fmt_currency(value: float | None) -> str:
-    if value is None:
-        return "N/A"
-    return f"${value:,.2f}"
+    return "N/A" if value is None else _CURRENCY_FORMAT(value)
 
 
 def _fmt_pct(value: float | None) -> str:
-    if value is None:
-        return "N/A"
-    return f"{value:.1%}"
+    return "N/A" if value is None else _PCT_FORMAT(value)
 
 
 def _fmt_ratio(value: float | None) -> str:
-    if value is None:
-        return "N/A"
-    return f"{value:.2f}x"
+    return "N/A" if value is None else _RATIO_FORMAT(value)
 
 
 def _fallback_summary(metrics: dict[str, Any]) -> str:
@@ -40,46 +51,52 @@ def _fallback_summary(metrics: dict[str, Any]) -> str:
     anomalies = metrics.get("anomalies", [])
     top_channels = latest.get("top_channels_by_revenue", [])[:3]
 
-    title = f"# Weekly Performance Report ({week_range.get('start', 'N/A')} to {week_range.get('end', 'N/A')})"
-
-    highlights = [
+    parts = [
+        f"# Weekly Performance Report ({week_range.get('start', 'N/A')} to {week_range.get('end', 'N/A')})",
+        "",
+        "## Highlights",
         f"- Revenue: {_fmt_currency(latest.get('revenue'))} across {latest.get('orders', 0)} orders (AOV {_fmt_currency(latest.get('aov'))})",
         f"- Spend: {_fmt_currency(latest.get('spend'))}; MER: {_fmt_ratio(latest.get('mer'))}",
         f"- Funnel: CTR {_fmt_pct(latest.get('ctr'))}, CVR {_fmt_pct(latest.get('cvr'))}, CAC proxy {_fmt_currency(latest.get('cac_proxy'))}",
         f"- Returning revenue share: {_fmt_pct(latest.get('returning_revenue_share'))}",
         f"- Rule-based anomalies flagged: {len(anomalies)}",
+        "",
+        "## Channel Performance",
     ]
 
-    channel_lines = []
     for item in top_channels:
-        channel_lines.append(
-            f"- {item['channel']}: revenue {_fmt_currency(item.get('revenue'))}; ROAS {_fmt_ratio(item.get('roas'))}"
-        )
-    if not channel_lines:
-        channel_lines = ["- No channel revenue data available for the latest week."]
+        parts.append(f"- {item['channel']}: revenue {_fmt_currency(item.get('revenue'))}; ROAS {_fmt_ratio(item.get('roas'))}")
+    if not top_channels:
+        parts.append("- No channel revenue data available for the latest week.")
 
-    anomaly_lines = []
+    parts += ["", "## Anomalies"]
     for a in anomalies[:8]:
-        anomaly_lines.append(f"- [{a.get('rule_id')}] {a.get('why')}")
-    if not anomaly_lines:
-        anomaly_lines = ["- No anomaly rules triggered this week."]
+        parts.append(f"- [{a.get('rule_id')}] {a.get('why')}")
+    if not anomalies:
+        parts.append("- No anomaly rules triggered this week.")
 
-    actions = [
+    parts += [
+        "",
+        "## What To Check Next",
         "- Validate tracking consistency for channels with the largest WoW swings in revenue or ROAS.",
         "- Review campaign-level spend and conversion quality for paid channels with rising CAC proxy.",
         "- Confirm returning customer promotions, CRM sends, and site changes if returning revenue share shifted materially.",
+        "",
+        "",
+        "> Note: Generated via deterministic fallback summary because Groq LLM was unavailable during this run.",
     ]
+    return "\n".join(parts)
 
-    return "\n\n".join(
-        [
-            title,
-            "## Highlights\n" + "\n".join(highlights),
-            "## Channel Performance\n" + "\n".join(channel_lines),
-            "## Anomalies\n" + "\n".join(anomaly_lines),
-            "## What To Check Next\n" + "\n".join(actions),
-            "\n> Note: Generated via deterministic fallback summary because Groq LLM was unavailable during this run.",
-        ]
-    )
+
+def _prune(value: Any) -> Any:
+    """Drop null dict entries and round floats so the prompt spends fewer tokens."""
+    if isinstance(value, dict):
+        return {k: _prune(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_prune(v) for v in value]
+    if isinstance(value, float):
+        return round(value, 4)
+    return value
 
 
 def _compact_metrics_for_llm(metrics: dict[str, Any]) -> dict[str, Any]:
@@ -105,25 +122,22 @@ def _compact_metrics_for_llm(metrics: dict[str, Any]) -> dict[str, Any]:
         "anomalies_summary": {
             "count_total": len(anomalies),
             "count_included": min(len(anomalies), MAX_ANOMALIES_FOR_LLM),
-            "rule_counts": {},
+            "rule_counts": dict(Counter(str(item.get("rule_id", "unknown")) for item in anomalies)),
         },
     }
-
-    rule_counts: dict[str, int] = {}
-    for item in anomalies:
-        rule_id = str(item.get("rule_id", "unknown"))
-        rule_counts[rule_id] = rule_counts.get(rule_id, 0) + 1
-    compact["anomalies_summary"]["rule_counts"] = rule_counts
-    return compact
+    return _prune(compact)
 
 
 def _build_prompt(metrics: dict[str, Any]) -> list[dict[str, str]]:
     compact_metrics = _compact_metrics_for_llm(metrics)
-    metrics_json = json.dumps(compact_metrics, indent=2)
+    if orjson is not None:
+        metrics_json = orjson.dumps(compact_metrics).decode()
+    else:
+        metrics_json = json.dumps(compact_metrics, separators=(",", ":"))
     system = (
         "You are a senior ecommerce analyst writing an executive-ready weekly report. "
         "Use only numbers present in the provided JSON. Do not invent, estimate, or infer missing values. "
-        "If a number is missing/null, say N/A."
+        "If a number is missing/null (keys with null values are omitted), say N/A."
     )
     user = (
         "Write a markdown report with EXACTLY these sections in this order:\n"
@@ -154,17 +168,23 @@ def generate_exec_summary(metrics: dict[str, Any], model: str = GROQ_MODEL) -> s
         return _fallback_summary(metrics)
 
     try:
-        client = OpenAI(base_url=GROQ_BASE_URL, api_key=api_key)
-        response = client.chat.completions.create(
+        client = _client(GROQ_BASE_URL, api_key)
+        stream = client.chat.completions.create(
             model=model,
             temperature=0.2,
             messages=_build_prompt(metrics),
+            stream=True,
         )
-        content = response.choices[0].message.content if response.choices else None
-        if not content or not str(content).strip():
+        parts: list[str] = []
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+        content = "".join(parts)
+        if not content.strip():
             raise ValueError("Empty LLM response content")
         logger.info("Generated report summary via Groq model %s", model)
-        return str(content).strip()
+        return content.strip()
     except Exception as exc:  # noqa: BLE001 - fallback is required behavior
         logger.error("Groq summary generation failed; using fallback summary: %s", exc)
         return _fallback_summary(metrics)
@@ -1,35 +1,31 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from transform import CANONICAL_CHANNELS
+from transform import CANONICAL_CHANNELS, CUSTOMER_TYPES
 
 logger = logging.getLogger(__name__)
 
+_NONE_CHANNELS: dict[str, float | None] = {c: None for c in CANONICAL_CHANNELS}
+
 
 def _week_start(series: pd.Series) -> pd.Series:
     ts = pd.to_datetime(series, errors="coerce")
     return (ts - pd.to_timedelta(ts.dt.weekday, unit="D")).dt.normalize()
 
 
-def _safe_div(numerator: float, denominator: float, none_on_zero: bool = False) -> float | None:
-    if denominator in (0, 0.0) or pd.isna(denominator):
-        return None if none_on_zero else 0.0
-    if pd.isna(numerator):
-        return None if none_on_zero else 0.0
-    return float(numerator) / float(denominator)
-
-
-def _wow_change(current: float | None, previous: float | None) -> float | None:
-    if current is None or previous is None:
-        return None
-    if previous == 0:
-        return None
-    return (current - previous) / previous
+def _wow_change(values: np.ndarray) -> np.ndarray:
+    """Week-over-week relative change along axis 0; NaN where either week is missing or the prior is zero."""
+    out = np.full(values.shape, np.nan)
+    previous = values[:-1]
+    np.divide(values[1:] - previous, previous, out=out[1:], where=previous != 0)
+    return out
 
 
 def _round(value: float | None, digits: int = 4) -> float | None:
@@ -38,54 +34,34 @@ def _round(value: float | None, digits: int = 4) -> float | None:
     return round(float(value), digits)
 
 
-def _to_date_str(value: Any) -> str:
-    if isinstance(value, pd.Timestamp):
-        return value.date().isoformat()
-    if isinstance(value, datetime):
-        return value.date().isoformat()
-    if isinstance(value, date):
-        return value.isoformat()
-    return str(value)
-
-
-def _empty_weekly_entry(week_start: str) -> dict[str, Any]:
-    channels = {c: 0.0 for c in CANONICAL_CHANNELS}
-    return {
-        "week_start": week_start,
-        "revenue": 0.0,
-        "orders": 0,
-        "aov": 0.0,
-        "revenue_split_by_customer_type": {"new": 0.0, "returning": 0.0, "unknown": 0.0},
-        "returning_revenue_share": 0.0,
-        "revenue_by_channel": channels.copy(),
-        "wow": {},
-    }
+def _round_wow(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 4)
 
 
-def _empty_marketing_entry(week_start: str) -> dict[str, Any]:
-    channels = {c: 0.0 for c in CANONICAL_CHANNELS}
-    return {
-        "week_start": week_start,
-        "spend": 0.0,
-        "impressions": 0,
-        "clicks": 0,
-        "conversions": 0,
-        "ctr": 0.0,
-        "cvr": 0.0,
-        "cpc": 0.0,
-        "cac_proxy": None,
-        "spend_by_channel": channels.copy(),
-        "wow": {},
-    }
+def _none_if_nan(value: float) -> float | None:
+    return None if np.isnan(value) else value
 
 
-def _empty_efficiency_entry(week_start: str) -> dict[str, Any]:
-    return {
-        "week_start": week_start,
-        "mer": None,
-        "roas_by_channel": {c: None for c in CANONICAL_CHANNELS},
-        "wow": {},
-    }
+def _round_array(values: Any, digits: int) -> np.ndarray:
+    """Element-wise Python round(); np.round scales by 10**digits first and can land on the other side of a tie."""
+    values = np.asarray(values, dtype=float)
+    return np.array([round(v, digits) for v in values.ravel().tolist()], dtype=float).reshape(values.shape)
+
+
+def _round_frame(frame: pd.DataFrame, digits: int) -> pd.DataFrame:
+    return pd.DataFrame(_round_array(frame, digits), index=frame.index, columns=frame.columns)
+
+
+def _ratio_column(numerator: np.ndarray, denominator: np.ndarray, none_on_zero: bool = False) -> np.ndarray:
+    """Element-wise numerator / denominator rounded to 4 digits; zero or missing inputs give 0.0 (NaN if none_on_zero)."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.full(numerator.shape, np.nan if none_on_zero else 0.0)
+    np.divide(numerator, denominator, out=out, where=(denominator != 0) & ~np.isnan(denominator) & ~np.isnan(numerator))
+    rounded = _round_array(out, 4)
+    if not none_on_zero:
+        rounded[rounded == 0] = 0.0
+    return rounded
 
 
 def _channel_sorted_top3(revenue_by_channel: dict[str, float], roas_by_channel: dict[str, float | None]) -> list[dict[str, Any]]:
@@ -200,147 +176,157 @@ def detect_anomalies(metrics: dict) -> list[dict[str, Any]]:
     return anomalies
 
 
+def _sales_aggregates(orders: pd.DataFrame, orders_week: pd.Series) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Weekly sales totals plus the customer-type and channel revenue breakdowns."""
+    if orders.empty:
+        return pd.DataFrame(columns=["revenue", "orders", "aov"]), pd.DataFrame(), pd.DataFrame()
+
+    # Everything is summed straight from the rows: rolling the breakdowns up from a finer groupby changes
+    # the float summation order, which is enough to move a rounded cent or AOV.
+    sales_totals = (
+        orders.groupby(orders_week, dropna=False)
+        .agg(revenue=("revenue", "sum"), orders=("order_id", "count"))
+        .sort_index()
+    )
+    sales_totals["aov"] = (sales_totals["revenue"] / sales_totals["orders"].replace(0, np.nan)).fillna(0.0)
+
+    customer_split = (
+        orders.groupby([orders_week, "customer_type"], dropna=False, observed=False)["revenue"]
+        .sum()
+        .unstack(fill_value=0.0)
+    )
+    revenue_by_channel = (
+        orders.groupby([orders_week, "channel"], dropna=False, observed=False)["revenue"]
+        .sum()
+        .unstack(fill_value=0.0)
+    )
+    return sales_totals, customer_split, revenue_by_channel
+
+
+def _ads_totals(ads: pd.DataFrame, ads_week: pd.Series) -> pd.DataFrame:
+    if ads.empty:
+        return pd.DataFrame(columns=["spend", "impressions", "clicks", "conversions"])
+    return (
+        ads.groupby(ads_week, dropna=False)
+        .agg(
+            spend=("spend", "sum"),
+            impressions=("impressions", "sum"),
+            clicks=("clicks", "sum"),
+            conversions=("conversions", "sum"),
+        )
+        .sort_index()
+    )
+
+
+def _ads_channel_spend(ads: pd.DataFrame, ads_week: pd.Series) -> pd.DataFrame:
+    if ads.empty:
+        return pd.DataFrame()
+    return ads.groupby([ads_week, "channel"], dropna=False, observed=False)["spend"].sum().unstack(fill_value=0.0)
+
+
 def compute_weekly_metrics(orders: pd.DataFrame, ads: pd.DataFrame) -> dict[str, Any]:
     """Compute weekly KPIs and anomalies from cleaned orders and ads data."""
     logger.info("Computing weekly metrics")
-    orders = orders.copy()
-    ads = ads.copy()
-
     if not orders.empty:
-        orders["week_start"] = _week_start(orders["order_date"])
+        orders_week = _week_start(orders["order_date"]).rename("week_start")
     else:
-        orders["week_start"] = pd.Series(dtype="datetime64[ns]")
+        orders_week = pd.Series(dtype="datetime64[ns]", name="week_start")
 
     if not ads.empty:
-        ads["week_start"] = _week_start(ads["date"])
+        ads_week = _week_start(ads["date"]).rename("week_start")
     else:
-        ads["week_start"] = pd.Series(dtype="datetime64[ns]")
-
-    weeks = sorted(set(orders.get("week_start", pd.Series(dtype="datetime64[ns]")).dropna().tolist()) | set(ads.get("week_start", pd.Series(dtype="datetime64[ns]")).dropna().tolist()))
-    week_strings = [_to_date_str(w) for w in weeks]
+        ads_week = pd.Series(dtype="datetime64[ns]", name="week_start")
+
+    weeks = pd.DatetimeIndex(np.union1d(orders_week.dropna().to_numpy(), ads_week.dropna().to_numpy()))
+    week_strings = weeks.strftime("%Y-%m-%d").tolist()
+
+    # The orders rollup and the two ads groupbys share no data; run them side by side.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sales_future = executor.submit(_sales_aggregates, orders, orders_week)
+        ads_totals_future = executor.submit(_ads_totals, ads, ads_week)
+        channel_spend_future = executor.submit(_ads_channel_spend, ads, ads_week)
+        sales_totals, customer_split, revenue_by_channel = sales_future.result()
+        ads_totals = ads_totals_future.result()
+        ads_channel_spend = channel_spend_future.result()
+
+    sales_totals = sales_totals.reindex(weeks, fill_value=0)
+    customer_split = customer_split.reindex(index=weeks, columns=CUSTOMER_TYPES, fill_value=0.0)
+    revenue_by_channel = revenue_by_channel.reindex(index=weeks, columns=CANONICAL_CHANNELS, fill_value=0.0)
+    ads_totals = ads_totals.reindex(weeks, fill_value=0)
+    ads_channel_spend = ads_channel_spend.reindex(index=weeks, columns=CANONICAL_CHANNELS, fill_value=0.0)
+
+    sales_totals["revenue"] = _round_array(sales_totals["revenue"], 2)
+    customer_split = _round_frame(customer_split, 2)
+    revenue_by_channel = _round_frame(revenue_by_channel, 2)
+    ads_totals["spend"] = _round_array(ads_totals["spend"], 2)
+    ads_channel_spend = _round_frame(ads_channel_spend, 2)
+
+    # Each section lives column-wise (one row per week) until the very end, where it is emitted as records.
+    revenue = sales_totals["revenue"].to_numpy(dtype=float)
+    customer_split.index = revenue_by_channel.index = week_strings
+    sales_df = pd.DataFrame(
+        {
+            "revenue": revenue,
+            "orders": sales_totals["orders"].to_numpy(),
+            "aov": _round_array(sales_totals["aov"], 2),
+            "returning_revenue_share": _ratio_column(customer_split["returning"].to_numpy(), revenue),
+        },
+        index=week_strings,
+    )
+
+    spend = ads_totals["spend"].to_numpy(dtype=float)
+    impressions = ads_totals["impressions"].to_numpy()
+    clicks = ads_totals["clicks"].to_numpy()
+    conversions = ads_totals["conversions"].to_numpy()
+    ads_channel_spend.index = week_strings
+    mk_df = pd.DataFrame(
+        {
+            "spend": spend,
+            "impressions": impressions,
+            "clicks": clicks,
+            "conversions": conversions,
+            "ctr": _ratio_column(clicks, impressions),
+            "cvr": _ratio_column(conversions, clicks),
+            "cpc": _ratio_column(spend, clicks),
+            "cac_proxy": _ratio_column(spend, conversions, none_on_zero=True),
+        },
+        index=week_strings,
+    )
+
+    eff_df = pd.DataFrame({"mer": _ratio_column(revenue, spend, none_on_zero=True)}, index=week_strings)
+    roas_by_channel = pd.DataFrame(
+        _ratio_column(revenue_by_channel.to_numpy(dtype=float), ads_channel_spend.to_numpy(dtype=float), none_on_zero=True),
+        index=week_strings,
+        columns=CANONICAL_CHANNELS,
+    )
+
+    # Relative WoW is (curr - prev) / prev rather than pct_change()'s curr / prev - 1, which can differ in
+    # the last bit and flip a 4-digit rounding; the share delta is a plain diff().
+    sales_wow = dict(zip(sales_df.columns, _wow_change(sales_df.to_numpy(dtype=float)).T, strict=True))
+    share_pp = sales_df["returning_revenue_share"].diff().tolist()
+    channel_revenue_wow = _wow_change(revenue_by_channel.to_numpy(dtype=float))
+    mk_wow = dict(zip(mk_df.columns, _wow_change(mk_df.to_numpy(dtype=float)).T, strict=True))
+    mer = [_none_if_nan(v) for v in eff_df["mer"].tolist()]
+    mer_wow = _wow_change(eff_df["mer"].to_numpy())
+    roas_wow = _wow_change(roas_by_channel.to_numpy())
+
+    sales_records = sales_df.to_dict(orient="records")
+    customer_split_records = customer_split.to_dict(orient="records")
+    revenue_by_channel_records = revenue_by_channel.to_dict(orient="records")
+    mk_records = mk_df.to_dict(orient="records")
+    spend_by_channel_records = ads_channel_spend.to_dict(orient="records")
+    roas_records = [
+        {c: _none_if_nan(v) for c, v in row.items()} for row in roas_by_channel.to_dict(orient="records")
+    ]
 
     sales_weekly: list[dict[str, Any]] = []
     marketing_weekly: list[dict[str, Any]] = []
     efficiency_weekly: list[dict[str, Any]] = []
-
-    if not orders.empty:
-        sales_totals = (
-            orders.groupby("week_start", dropna=False)
-            .agg(revenue=("revenue", "sum"), orders=("order_id", "count"))
-            .sort_index()
-        )
-        sales_totals["aov"] = sales_totals.apply(lambda row: _safe_div(row["revenue"], row["orders"]) or 0.0, axis=1)
-
-        customer_split = (
-            orders.groupby(["week_start", "customer_type"], dropna=False)["revenue"]
-            .sum()
-            .unstack(fill_value=0.0)
-        )
-        revenue_by_channel = (
-            orders.groupby(["week_start", "channel"], dropna=False)["revenue"]
-            .sum()
-            .unstack(fill_value=0.0)
-        )
-    else:
-        sales_totals = pd.DataFrame(columns=["revenue", "orders", "aov"])
-        customer_split = pd.DataFrame()
-        revenue_by_channel = pd.DataFrame()
-
-    if not ads.empty:
-        ads_totals = (
-            ads.groupby("week_start", dropna=False)
-            .agg(
-                spend=("spend", "sum"),
-                impressions=("impressions", "sum"),
-                clicks=("clicks", "sum"),
-                conversions=("conversions", "sum"),
-            )
-            .sort_index()
-        )
-        ads_channel_spend = (
-            ads.groupby(["week_start", "channel"], dropna=False)["spend"]
-            .sum()
-            .unstack(fill_value=0.0)
-        )
-    else:
-        ads_totals = pd.DataFrame(columns=["spend", "impressions", "clicks", "conversions"])
-        ads_channel_spend = pd.DataFrame()
-
-    for week, week_str in zip(weeks, week_strings, strict=False):
-        sales_entry = _empty_weekly_entry(week_str)
-        if week in sales_totals.index:
-            row = sales_totals.loc[week]
-            sales_entry["revenue"] = round(float(row.get("revenue", 0.0)), 2)
-            sales_entry["orders"] = int(row.get("orders", 0))
-            sales_entry["aov"] = round(float(row.get("aov", 0.0)), 2)
-
-        if week in customer_split.index:
-            for ct in ["new", "returning", "unknown"]:
-                sales_entry["revenue_split_by_customer_type"][ct] = round(float(customer_split.loc[week].get(ct, 0.0)), 2)
-
-        if week in revenue_by_channel.index:
-            for channel in CANONICAL_CHANNELS:
-                sales_entry["revenue_by_channel"][channel] = round(float(revenue_by_channel.loc[week].get(channel, 0.0)), 2)
-
-        sales_entry["returning_revenue_share"] = _round(
-            _safe_div(
-                sales_entry["revenue_split_by_customer_type"]["returning"],
-                sales_entry["revenue"],
-            )
-            or 0.0,
-            4,
-        ) or 0.0
-        sales_weekly.append(sales_entry)
-
-        mk_entry = _empty_marketing_entry(week_str)
-        if week in ads_totals.index:
-            row = ads_totals.loc[week]
-            mk_entry["spend"] = round(float(row.get("spend", 0.0)), 2)
-            mk_entry["impressions"] = int(float(row.get("impressions", 0.0)))
-            mk_entry["clicks"] = int(float(row.get("clicks", 0.0)))
-            mk_entry["conversions"] = int(float(row.get("conversions", 0.0)))
-        if week in ads_channel_spend.index:
-            for channel in CANONICAL_CHANNELS:
-                mk_entry["spend_by_channel"][channel] = round(float(ads_channel_spend.loc[week].get(channel, 0.0)), 2)
-
-        mk_entry["ctr"] = _round(_safe_div(mk_entry["clicks"], mk_entry["impressions"]) or 0.0, 4) or 0.0
-        mk_entry["cvr"] = _round(_safe_div(mk_entry["conversions"], mk_entry["clicks"]) or 0.0, 4) or 0.0
-        mk_entry["cpc"] = _round(_safe_div(mk_entry["spend"], mk_entry["clicks"]) or 0.0, 4) or 0.0
-        mk_entry["cac_proxy"] = _round(_safe_div(mk_entry["spend"], mk_entry["conversions"], none_on_zero=True), 4)
-        marketing_weekly.append(mk_entry)
-
-        eff_entry = _empty_efficiency_entry(week_str)
-        eff_entry["mer"] = _round(_safe_div(sales_entry["revenue"], mk_entry["spend"], none_on_zero=True), 4)
-        for channel in CANONICAL_CHANNELS:
-            spend = mk_entry["spend_by_channel"].get(channel, 0.0)
-            revenue = sales_entry["revenue_by_channel"].get(channel, 0.0)
-            eff_entry["roas_by_channel"][channel] = _round(_safe_div(revenue, spend, none_on_zero=True), 4)
-        efficiency_weekly.append(eff_entry)
-
-    for idx in range(len(week_strings)):
-        prev_sales = sales_weekly[idx - 1] if idx > 0 else None
-        curr_sales = sales_weekly[idx]
-        if prev_sales:
-            curr_sales["wow"] = {
-                "revenue": _round(_wow_change(curr_sales["revenue"], prev_sales["revenue"]), 4),
-                "orders": _round(_wow_change(float(curr_sales["orders"]), float(prev_sales["orders"])), 4),
-                "aov": _round(_wow_change(curr_sales["aov"], prev_sales["aov"]), 4),
-                "returning_revenue_share": _round(
-                    _wow_change(curr_sales["returning_revenue_share"], prev_sales["returning_revenue_share"]), 4
-                ),
-                "returning_revenue_share_pp": _round(
-                    curr_sales["returning_revenue_share"] - prev_sales["returning_revenue_share"], 4
-                ),
-                "previous_revenue": prev_sales["revenue"],
-                "previous_returning_revenue_share": prev_sales["returning_revenue_share"],
-                "revenue_by_channel": {
-                    c: _round(_wow_change(curr_sales["revenue_by_channel"][c], prev_sales["revenue_by_channel"][c]), 4)
-                    for c in CANONICAL_CHANNELS
-                },
-                "previous_revenue_by_channel": {c: prev_sales["revenue_by_channel"][c] for c in CANONICAL_CHANNELS},
-            }
-        else:
-            curr_sales["wow"] = {
+    for idx, week_str in enumerate(week_strings):
+        sales = sales_records[idx]
+        mk = mk_records[idx]
+        if idx == 0:
+            sales_wow_entry: dict[str, Any] = {
                 "revenue": None,
                 "orders": None,
                 "aov": None,
@@ -348,40 +334,78 @@ def compute_weekly_metrics(orders: pd.DataFrame, ads: pd.DataFrame) -> dict[str,
                 "returning_revenue_share_pp": None,
                 "previous_revenue": None,
                 "previous_returning_revenue_share": None,
-                "revenue_by_channel": {c: None for c in CANONICAL_CHANNELS},
-                "previous_revenue_by_channel": {c: None for c in CANONICAL_CHANNELS},
+                "revenue_by_channel": _NONE_CHANNELS.copy(),
+                "previous_revenue_by_channel": _NONE_CHANNELS.copy(),
             }
-
-        prev_mk = marketing_weekly[idx - 1] if idx > 0 else None
-        curr_mk = marketing_weekly[idx]
-        if prev_mk:
-            curr_mk["wow"] = {
-                "spend": _round(_wow_change(curr_mk["spend"], prev_mk["spend"]), 4),
-                "ctr": _round(_wow_change(curr_mk["ctr"], prev_mk["ctr"]), 4),
-                "cvr": _round(_wow_change(curr_mk["cvr"], prev_mk["cvr"]), 4),
-                "cac_proxy": _round(_wow_change(curr_mk["cac_proxy"], prev_mk["cac_proxy"]), 4),
-                "previous_spend": prev_mk["spend"],
+            mk_wow_entry: dict[str, Any] = {"spend": None, "ctr": None, "cvr": None, "cac_proxy": None, "previous_spend": None}
+            eff_wow_entry: dict[str, Any] = {
+                "mer": None,
+                "roas_by_channel": _NONE_CHANNELS.copy(),
+                "previous_roas_by_channel": _NONE_CHANNELS.copy(),
             }
         else:
-            curr_mk["wow"] = {"spend": None, "ctr": None, "cvr": None, "cac_proxy": None, "previous_spend": None}
-
-        prev_eff = efficiency_weekly[idx - 1] if idx > 0 else None
-        curr_eff = efficiency_weekly[idx]
-        if prev_eff:
-            curr_eff["wow"] = {
-                "mer": _round(_wow_change(curr_eff["mer"], prev_eff["mer"]), 4),
-                "roas_by_channel": {
-                    c: _round(_wow_change(curr_eff["roas_by_channel"][c], prev_eff["roas_by_channel"][c]), 4)
-                    for c in CANONICAL_CHANNELS
+            prev_sales = sales_records[idx - 1]
+            sales_wow_entry = {
+                "revenue": _round_wow(sales_wow["revenue"][idx]),
+                "orders": _round_wow(sales_wow["orders"][idx]),
+                "aov": _round_wow(sales_wow["aov"][idx]),
+                "returning_revenue_share": _round_wow(sales_wow["returning_revenue_share"][idx]),
+                "returning_revenue_share_pp": round(share_pp[idx], 4),
+                "previous_revenue": prev_sales["revenue"],
+                "previous_returning_revenue_share": prev_sales["returning_revenue_share"],
+                "revenue_by_channel": {
+                    c: _round_wow(v) for c, v in zip(CANONICAL_CHANNELS, channel_revenue_wow[idx], strict=True)
                 },
-                "previous_roas_by_channel": {c: prev_eff["roas_by_channel"][c] for c in CANONICAL_CHANNELS},
+                "previous_revenue_by_channel": revenue_by_channel_records[idx - 1].copy(),
             }
-        else:
-            curr_eff["wow"] = {
-                "mer": None,
-                "roas_by_channel": {c: None for c in CANONICAL_CHANNELS},
-                "previous_roas_by_channel": {c: None for c in CANONICAL_CHANNELS},
+            mk_wow_entry = {
+                "spend": _round_wow(mk_wow["spend"][idx]),
+                "ctr": _round_wow(mk_wow["ctr"][idx]),
+                "cvr": _round_wow(mk_wow["cvr"][idx]),
+                "cac_proxy": _round_wow(mk_wow["cac_proxy"][idx]),
+                "previous_spend": mk_records[idx - 1]["spend"],
+            }
+            eff_wow_entry = {
+                "mer": _round_wow(mer_wow[idx]),
+                "roas_by_channel": {c: _round_wow(v) for c, v in zip(CANONICAL_CHANNELS, roas_wow[idx], strict=True)},
+                "previous_roas_by_channel": roas_records[idx - 1].copy(),
+            }
+
+        sales_weekly.append(
+            {
+                "week_start": week_str,
+                "revenue": sales["revenue"],
+                "orders": int(sales["orders"]),
+                "aov": sales["aov"],
+                "revenue_split_by_customer_type": customer_split_records[idx],
+                "returning_revenue_share": sales["returning_revenue_share"],
+                "revenue_by_channel": revenue_by_channel_records[idx],
+                "wow": sales_wow_entry,
             }
+        )
+        marketing_weekly.append(
+            {
+                "week_start": week_str,
+                "spend": mk["spend"],
+                "impressions": int(mk["impressions"]),
+                "clicks": int(mk["clicks"]),
+                "conversions": int(mk["conversions"]),
+                "ctr": mk["ctr"],
+                "cvr": mk["cvr"],
+                "cpc": mk["cpc"],
+                "cac_proxy": _none_if_nan(mk["cac_proxy"]),
+                "spend_by_channel": spend_by_channel_records[idx],
+                "wow": mk_wow_entry,
+            }
+        )
+        efficiency_weekly.append(
+            {
+                "week_start": week_str,
+                "mer": mer[idx],
+                "roas_by_channel": roas_records[idx],
+                "wow": eff_wow_entry,
+            }
+        )
 
     latest_snapshot: dict[str, Any]
     if week_strings:
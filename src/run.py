@@ -40,8 +40,11 @@ def main() -> None:
     print(f"Saved weekly report: {saved['weekly_report']}")
     print(f"Saved latest report: {saved['latest_report']}")
     print(f"Saved metrics JSON: {saved['metrics_json']}")
-    print(f"Saved weekly CSV: {saved['weekly_csv']}")
-    print(f"Saved latest CSV: {saved['latest_csv']}")
+    if "weekly_csv" in saved:
+        print(f"Saved weekly CSV: {saved['weekly_csv']}")
+        print(f"Saved latest CSV: {saved['latest_csv']}")
+    else:
+        print("Skipped weekly CSV: no weekly metrics")
     logger.info("Pipeline run complete")
 
 
@@ -2,14 +2,36 @@ from __future__ import annotations
 
 import logging
 import re
-from datetime import datetime
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 CANONICAL_CHANNELS = ["paid_social", "search", "email", "organic", "direct", "unknown"]
+CUSTOMER_TYPES = ["new", "returning", "unknown"]
+ORDER_COLUMNS = ["order_id", "order_date", "channel", "revenue", "customer_type", "country"]
+ADS_COLUMNS = ["date", "channel", "campaign", "spend", "impressions", "clicks", "conversions"]
+_BLANK_TOKENS = frozenset({"", "na", "n/a", "null", "none", "nan"})
+_PAID_SOCIAL_COMPACT = frozenset(
+    {"fb", "facebook", "facebooks", "facebok", "facebookads", "facebooksads", "facebokads", "ig", "instagram", "meta"}
+)
+_EMAIL_COMPACT = frozenset({"newsletter", "email", "mail", "klaviyo"})
+_CUSTOMER_TYPE_MAP = {
+    "new": "new",
+    "first": "new",
+    "1st": "new",
+    "first-time": "new",
+    "first_time": "new",
+    "returning": "returning",
+    "repeat": "returning",
+    "existing": "returning",
+    "return": "returning",
+}
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_RE_MONEY_STRIP = re.compile(r"[^0-9,.-]")
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%b %d %Y", "%Y/%m/%d", "%B %d %Y")
 
 
 def normalize_channel(raw: str | None) -> str:
@@ -20,9 +42,9 @@ def normalize_channel(raw: str | None) -> str:
     if not text:
         return "unknown"
 
-    compact = re.sub(r"[^a-z0-9]+", "", text)
+    compact = _RE_NON_ALNUM.sub("", text)
 
-    if compact in {"fb", "facebook", "facebooks", "facebok", "facebookads", "facebooksads", "facebokads", "ig", "instagram", "meta"}:
+    if compact in _PAID_SOCIAL_COMPACT:
         return "paid_social"
     if "face" in text and "book" in text:
         return "paid_social"
@@ -33,7 +55,7 @@ def normalize_channel(raw: str | None) -> str:
 
     if "google" in text or "search" in text:
         return "search"
-    if compact in {"newsletter", "email", "mail", "klaviyo"}:
+    if compact in _EMAIL_COMPACT:
         return "email"
     if "newsletter" in text or text == "email":
         return "email"
@@ -44,13 +66,33 @@ def normalize_channel(raw: str | None) -> str:
     return "unknown"
 
 
+def normalize_channels(values: pd.Series) -> pd.Series:
+    """Vectorized normalize_channel over a whole column; rules are checked in the same order."""
+    text = values.astype("string").str.strip().str.lower()
+    compact = text.str.replace(_RE_NON_ALNUM, "", regex=True)
+
+    def has(needle: str) -> pd.Series:
+        return text.str.contains(needle, regex=False, na=False)
+
+    conditions = [
+        compact.isin(_PAID_SOCIAL_COMPACT) | (has("face") & has("book")) | has("instagram") | has("tiktok"),
+        has("google") | has("search"),
+        compact.isin(_EMAIL_COMPACT) | has("newsletter") | text.eq("email").fillna(False),
+        has("organic"),
+        has("direct"),
+    ]
+    choices = ["paid_social", "search", "email", "organic", "direct"]
+    channels = np.select([c.to_numpy(dtype=bool) for c in conditions], choices, default="unknown")
+    return pd.Series(channels, index=values.index)
+
+
 def _is_blank(value: Any) -> bool:
     if value is None:
         return True
     if isinstance(value, float) and pd.isna(value):
         return True
     text = str(value).strip().lower()
-    return text in {"", "na", "n/a", "null", "none", "nan"}
+    return text in _BLANK_TOKENS
 
 
 def parse_money_to_float(raw: Any) -> float:
@@ -66,7 +108,7 @@ def parse_money_to_float(raw: Any) -> float:
     if text.startswith("-"):
         negative = True
 
-    cleaned = re.sub(r"[^0-9,.-]", "", text)
+    cleaned = _RE_MONEY_STRIP.sub("", text)
     cleaned = cleaned.replace(" ", "")
     if cleaned.count("-") > 1:
         cleaned = cleaned.replace("-", "")
@@ -104,84 +146,110 @@ def parse_money_to_float(raw: Any) -> float:
     return -value if negative else value
 
 
-def _parse_generic_number(raw: Any) -> float:
-    if _is_blank(raw):
-        return 0.0
-    text = str(raw).strip()
-    text = re.sub(r"[^0-9,.-]", "", text)
-    if not text:
-        return 0.0
-
-    if "," in text and "." in text:
-        if text.rfind(",") > text.rfind("."):
-            text = text.replace(".", "").replace(",", ".")
-        else:
-            text = text.replace(",", "")
-    elif "," in text:
-        parts = text.split(",")
-        if len(parts) == 2 and len(parts[-1]) in {1, 2}:
-            text = parts[0] + "." + parts[1]
-        else:
-            text = text.replace(",", "")
-    elif text.count(".") > 1:
-        parts = text.split(".")
-        if len(parts[-1]) in {1, 2}:
-            text = "".join(parts[:-1]) + "." + parts[-1]
-        else:
-            text = "".join(parts)
-
-    try:
-        return float(text)
-    except ValueError:
-        logger.warning("Failed to parse numeric value %r; defaulting to 0", raw)
-        return 0.0
-
-
-def _parse_mixed_date(value: Any) -> pd.Timestamp:
-    if _is_blank(value):
-        return pd.NaT
-    text = str(value).strip()
-    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%b %d %Y", "%Y/%m/%d", "%B %d %Y"):
-        try:
-            return pd.Timestamp(datetime.strptime(text, fmt)).normalize()
-        except ValueError:
-            continue
-    parsed = pd.to_datetime(text, errors="coerce", dayfirst=False)
-    if pd.isna(parsed):
-        return pd.NaT
-    return pd.Timestamp(parsed).normalize()
-
-
-def _normalize_customer_type(raw: Any) -> str:
-    if _is_blank(raw):
-        return "unknown"
-    text = str(raw).strip().lower()
-    if text in {"new", "first", "1st", "first-time", "first_time"}:
-        return "new"
-    if text in {"returning", "repeat", "existing", "return"}:
-        return "returning"
-    return "unknown"
+def _split_blank_text(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    text = values.astype("string").str.strip().reset_index(drop=True)
+    blank = text.isna() | text.str.lower().isin(_BLANK_TOKENS)
+    return text.fillna(""), blank
+
+
+def _normalize_separators(text: pd.Series, single_decimal_comma: bool) -> pd.Series:
+    """Vectorized US/EU thousands/decimal separator handling shared by the column parsers."""
+    out = text.copy()
+    has_comma = text.str.contains(",", regex=False)
+    has_dot = text.str.contains(".", regex=False)
+
+    both = has_comma & has_dot
+    comma_last = both & (text.str.rfind(",") > text.str.rfind("."))
+    out[comma_last] = text[comma_last].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    out[both & ~comma_last] = text[both & ~comma_last].str.replace(",", "", regex=False)
+
+    only_comma = has_comma & ~has_dot
+    decimal_pattern = r"^[^,]*,[0-9-]{1,2}$" if single_decimal_comma else r",[0-9-]{1,2}$"
+    decimal_comma = only_comma & text.str.contains(decimal_pattern, regex=True)
+    out[decimal_comma] = (
+        text[decimal_comma].str.replace(r",(?=.*,)", "", regex=True).str.replace(",", ".", regex=False)
+    )
+    out[only_comma & ~decimal_comma] = text[only_comma & ~decimal_comma].str.replace(",", "", regex=False)
+
+    multi_dot = ~has_comma & (text.str.count(r"\.") > 1)
+    decimal_dot = multi_dot & text.str.contains(r"\.[0-9-]{1,2}$", regex=True)
+    out[decimal_dot] = text[decimal_dot].str.replace(r"\.(?=.*\.)", "", regex=True)
+    out[multi_dot & ~decimal_dot] = text[multi_dot & ~decimal_dot].str.replace(".", "", regex=False)
+    return out
+
+
+def _to_float(normalized: pd.Series, skip: pd.Series, raw: pd.Series, label: str) -> tuple[pd.Series, pd.Series]:
+    # to_numeric only spots the failures: its string parser is not correctly rounded, float() is.
+    failed = ~skip & pd.to_numeric(normalized.where(~skip).astype(object), errors="coerce").isna()
+    for value in raw[failed.to_numpy()]:
+        logger.warning("Failed to parse %s value %r; defaulting to 0", label, value)
+    parsed = pd.Series(0.0, index=normalized.index)
+    ok = (~skip & ~failed).to_numpy()
+    parsed[ok] = normalized[ok].astype(object).astype(float).to_numpy()
+    return parsed, failed
+
+
+def parse_money_series(values: pd.Series) -> pd.Series:
+    """Vectorized parse_money_to_float over a whole column."""
+    text, blank = _split_blank_text(values)
+    paren = text.str.startswith("(") & text.str.endswith(")")
+    text = text.mask(paren, text.str.slice(1, -1))
+    negative = paren | text.str.startswith("-")
+
+    cleaned = text.str.replace(_RE_MONEY_STRIP, "", regex=True)
+    multi_minus = cleaned.str.count("-") > 1
+    cleaned = cleaned.mask(multi_minus, cleaned.str.replace("-", "", regex=False)).str.lstrip("-")
+    negative |= multi_minus
+
+    skip = blank | cleaned.eq("")
+    parsed, failed = _to_float(_normalize_separators(cleaned, single_decimal_comma=False), skip, values, "money")
+    parsed = parsed.where(~(negative & ~skip & ~failed), -parsed)
+    return parsed.astype(float).set_axis(values.index)
+
+
+def _parse_generic_number_series(values: pd.Series) -> pd.Series:
+    text, blank = _split_blank_text(values)
+    cleaned = text.str.replace(_RE_MONEY_STRIP, "", regex=True)
+    skip = blank | cleaned.eq("")
+    parsed, _ = _to_float(_normalize_separators(cleaned, single_decimal_comma=True), skip, values, "numeric")
+    return parsed.astype(float).set_axis(values.index)
+
+
+def _parse_mixed_dates(values: pd.Series) -> pd.Series:
+    """Parse a column of mixed-format dates, one vectorized pass per known format."""
+    text = values.astype("string").str.strip().reset_index(drop=True)
+    text = text.mask(text.str.lower().isin(_BLANK_TOKENS))
+
+    parsed = pd.to_datetime(text, format=_DATE_FORMATS[0], errors="coerce")
+    for fmt in _DATE_FORMATS[1:]:
+        pending = parsed.isna() & text.notna()
+        if not pending.any():
+            break
+        parsed = parsed.fillna(pd.to_datetime(text.where(pending), format=fmt, errors="coerce"))
+
+    pending = parsed.isna() & text.notna()
+    if pending.any():
+        parsed = parsed.fillna(pd.to_datetime(text.where(pending), format="mixed", errors="coerce"))
+    return parsed.dt.normalize().set_axis(values.index)
 
 
 def clean_orders(df: pd.DataFrame) -> pd.DataFrame:
     """Clean orders data and return standardized columns."""
     logger.info("Cleaning orders data (%s raw rows)", len(df))
-    out = df.copy()
-
-    for col in ["order_id", "order_date", "channel", "revenue", "customer_type", "country"]:
-        if col not in out.columns:
-            out[col] = pd.NA
+    out = df.reindex(columns=ORDER_COLUMNS)
 
     out["order_id"] = out["order_id"].astype("string").str.strip()
-    out["order_date"] = out["order_date"].apply(_parse_mixed_date)
+    out["order_date"] = _parse_mixed_dates(out["order_date"])
     invalid_dates = int(out["order_date"].isna().sum())
     if invalid_dates:
         logger.warning("Dropping %s orders with invalid/missing order_date", invalid_dates)
     out = out.dropna(subset=["order_date"])
 
-    out["channel"] = out["channel"].apply(normalize_channel)
-    out["revenue"] = out["revenue"].apply(parse_money_to_float).astype(float)
-    out["customer_type"] = out["customer_type"].apply(_normalize_customer_type)
+    out["channel"] = normalize_channels(out["channel"])
+    out["revenue"] = parse_money_series(out["revenue"])
+    out["customer_type"] = (
+        out["customer_type"].astype("string").str.strip().str.lower().map(_CUSTOMER_TYPE_MAP).fillna("unknown")
+    )
     out["country"] = out["country"].fillna("unknown").astype("string").str.strip().replace("", "unknown")
 
     before_dedupe = len(out)
@@ -191,32 +259,31 @@ def clean_orders(df: pd.DataFrame) -> pd.DataFrame:
         logger.warning("Removed %s duplicate order rows by order_id (kept last)", dropped_dupes)
 
     out = out.sort_values("order_date").reset_index(drop=True)
+    out["channel"] = pd.Categorical(out["channel"], categories=CANONICAL_CHANNELS)
+    out["customer_type"] = pd.Categorical(out["customer_type"], categories=CUSTOMER_TYPES)
     logger.info("Cleaned orders rows: %s", len(out))
-    return out[["order_id", "order_date", "channel", "revenue", "customer_type", "country"]]
+    return out
 
 
 def clean_ads(df: pd.DataFrame) -> pd.DataFrame:
     """Clean ads performance data and return standardized columns."""
     logger.info("Cleaning ads data (%s raw rows)", len(df))
-    out = df.copy()
-
-    for col in ["date", "channel", "campaign", "spend", "impressions", "clicks", "conversions"]:
-        if col not in out.columns:
-            out[col] = pd.NA
+    out = df.reindex(columns=ADS_COLUMNS)
 
-    out["date"] = out["date"].apply(_parse_mixed_date)
+    out["date"] = _parse_mixed_dates(out["date"])
     invalid_dates = int(out["date"].isna().sum())
     if invalid_dates:
         logger.warning("Dropping %s ads rows with invalid/missing date", invalid_dates)
     out = out.dropna(subset=["date"])
 
-    out["channel"] = out["channel"].apply(normalize_channel)
+    out["channel"] = normalize_channels(out["channel"])
     out["campaign"] = out["campaign"].fillna("unknown").astype("string").str.strip().replace("", "unknown")
-    out["spend"] = out["spend"].apply(parse_money_to_float).astype(float)
-    out["impressions"] = out["impressions"].apply(_parse_generic_number).round(0).astype(float)
-    out["clicks"] = out["clicks"].apply(_parse_generic_number).round(0).astype(float)
-    out["conversions"] = out["conversions"].apply(_parse_generic_number).round(0).astype(float)
+    out["spend"] = parse_money_series(out["spend"])
+    out["impressions"] = _parse_generic_number_series(out["impressions"]).round().astype("int64")
+    out["clicks"] = _parse_generic_number_series(out["clicks"]).round().astype("int64")
+    out["conversions"] = _parse_generic_number_series(out["conversions"]).round().astype("int64")
 
     out = out.sort_values("date").reset_index(drop=True)
+    out["channel"] = pd.Categorical(out["channel"], categories=CANONICAL_CHANNELS)
     logger.info("Cleaned ads rows: %s", len(out))
-    return out[["date", "channel", "campaign", "spend", "impressions", "clicks", "conversions"]]
+    return out